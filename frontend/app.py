@@ -7,6 +7,8 @@ A retro Nintendo-style web interface for generating artistic portraits from GitH
 import streamlit as st
 import sys
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 import json
 from typing import Optional, Dict, Any
@@ -16,7 +18,39 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from git_to_image import github_analyzer, prompt_generator
 from git_to_image.image_generator import ImageGenerator
-from git_to_image.image_to_image_generator import ImageToImageGenerator
+# ImageToImageGenerator is imported lazily so Text-to-Image sessions
+# don't pay its import cost
+
+# Map UI transformation modes to backend style modes
+STYLE_MODE_MAP = {
+    "Portrait Enhancement": "tech_enhancement",
+    "Character Fusion": "character_fusion",
+    "Style Transfer": "artistic_transformation",
+    "Technical Overlay": "fusion"
+}
+
+# Widget option lists, hoisted so they aren't rebuilt on every rerun
+GENERATION_MODES = ("Text-to-Image", "Image-to-Image")
+AUTO_MODE_OPTIONS = ("🍀 I feel lucky (Let AI decide)", "🎯 Custom options")
+ARTISTIC_STYLES = (
+    "Vibrant pop art", "Minimalist design", "Dark cyberpunk",
+    "1980s retro wave", "Futuristic cyberpunk", "Chinese ink wash painting",
+    "Steampunk mechanical", "Dark fantasy concept art"
+)
+CHARACTER_ARCHETYPES = (
+    "Majestic Bear", "Wise Owl", "Industrious Beaver", "Cunning Fox",
+    "Agile Octopus", "Loyal Wolf", "Meticulous Hummingbird",
+    "Playful Otter", "GitHub Octopus"
+)
+BACKGROUND_ENVIRONMENTS = (
+    "A server room with glowing racks", "A digital forest with flowing data streams",
+    "A library of ancient code scrolls", "A futuristic city skyline",
+    "A workshop filled with gears and circuits",
+    "An abstract representation of a neural network"
+)
+TRANSFORMATION_MODES = (
+    "Portrait Enhancement", "Character Fusion", "Style Transfer", "Technical Overlay"
+)
 
 # Page configuration
 st.set_page_config(
@@ -27,8 +61,10 @@ st.set_page_config(
 )
 
 # Custom CSS for Nintendo-style theme
-def load_css():
-    st.markdown("""
+@st.cache_data
+def _css_blob() -> str:
+    """Build the retro stylesheet once; cached across Streamlit reruns"""
+    return """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Press+Start+2P&display=swap');
     
@@ -175,29 +211,163 @@ def load_css():
         border-radius: 5px;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def load_css():
+    st.markdown(_css_blob(), unsafe_allow_html=True)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_profile_cached(path_str: str, mtime: float) -> Optional[Dict[str, Any]]:
+    """Load and parse a profile JSON once per (path, mtime) combination"""
+    try:
+        with open(path_str, 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+
+class BatchingScheduler:
+    """Coalesce concurrent same-mode generation requests into batched backend calls.
+
+    When several users click generate within the buffering window, requests
+    sharing a style mode are dispatched together through
+    generate_profile_based_portrait_batch instead of one Gemini call each.
+    """
+
+    def __init__(self, generator, session_timeout=2.0, max_batch_size=4):
+        self.generator = generator
+        self.session_timeout = session_timeout
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._pending = {}  # style_mode -> list of (profile, image_path, prompt, Future)
+        self._timers = {}   # style_mode -> threading.Timer
+        self._in_flight = set()  # style modes with a batch currently running
+
+    def submit(self, profile, image_path, style_mode, prompt=None) -> Future:
+        """Queue a request; the returned Future resolves with the generation result"""
+        future = Future()
+        with self._lock:
+            bucket = self._pending.setdefault(style_mode, [])
+            bucket.append((profile, image_path, prompt, future))
+            # Only buffer while a batch for this mode is already running;
+            # an otherwise idle mode dispatches immediately so a lone user
+            # never waits out the coalescing window
+            if style_mode not in self._in_flight or len(bucket) >= self.max_batch_size:
+                self._cancel_timer(style_mode)
+                self._flush_locked(style_mode)
+            elif style_mode not in self._timers:
+                timer = threading.Timer(self.session_timeout, self._flush, args=(style_mode,))
+                timer.daemon = True
+                self._timers[style_mode] = timer
+                timer.start()
+        return future
+
+    def _cancel_timer(self, style_mode):
+        timer = self._timers.pop(style_mode, None)
+        if timer:
+            timer.cancel()
+
+    def _flush(self, style_mode):
+        with self._lock:
+            self._timers.pop(style_mode, None)
+            self._flush_locked(style_mode)
+
+    def _flush_locked(self, style_mode):
+        batch = self._pending.pop(style_mode, [])
+        if not batch:
+            return
+        self._in_flight.add(style_mode)
+        threading.Thread(target=self._run_batch, args=(style_mode, batch), daemon=True).start()
+
+    def _run_batch(self, style_mode, batch):
+        try:
+            results = self.generator.generate_profile_based_portrait_batch(
+                [(profile, image_path, prompt) for profile, image_path, prompt, _ in batch],
+                style_mode=style_mode
+            )
+            for (_, _, _, future), result in zip(batch, results):
+                future.set_result(result)
+        except Exception as e:
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            with self._lock:
+                self._in_flight.discard(style_mode)
+                # Dispatch anything that accumulated while we were running
+                # instead of making it wait out the timer
+                if self._pending.get(style_mode):
+                    self._cancel_timer(style_mode)
+                    self._flush_locked(style_mode)
+
+
+@st.cache_resource
+def _image_generator(output_dir_str: str) -> ImageGenerator:
+    """Build the text-to-image generator once per process, not per rerun"""
+    return ImageGenerator(Path(output_dir_str))
+
+
+@st.cache_resource
+def _image_to_image_generator():
+    """Build the image-to-image generator once per process, not per rerun.
+
+    The import lives here so Text-to-Image sessions never pay the cost of
+    loading the image-to-image module at all.
+    """
+    from git_to_image.image_to_image_generator import ImageToImageGenerator
+    return ImageToImageGenerator()
+
+
+@st.cache_resource
+def _batch_scheduler() -> BatchingScheduler:
+    """Shared scheduler so pending batches survive Streamlit reruns"""
+    return BatchingScheduler(_image_to_image_generator(), session_timeout=2.0, max_batch_size=4)
+
+
+@st.cache_resource
+def _pipeline_pool() -> ThreadPoolExecutor:
+    """Shared pool for overlapping the I/O-bound pipeline stages"""
+    return ThreadPoolExecutor(max_workers=3)
+
 
 class GitToImageUI:
+    # Directory creation only needs to happen once per process, not per rerun
+    _dirs_ready = False
+
     def __init__(self):
         self.output_dir = Path("generated_images")
         self.profile_dir = Path("user_profile")
-        self.image_generator = ImageGenerator(self.output_dir)
-        self.image_to_image_generator = ImageToImageGenerator()
-        
-        # Ensure directories exist
-        self.output_dir.mkdir(exist_ok=True)
-        self.profile_dir.mkdir(exist_ok=True)
-    
+        self.image_generator = _image_generator(str(self.output_dir))
+        # Small pool used to overlap the I/O-bound pipeline stages
+        # (avatar download, validation, prompt assembly)
+        self.pipeline_pool = _pipeline_pool()
+
+        # Ensure directories exist (first construction only)
+        if not GitToImageUI._dirs_ready:
+            self.output_dir.mkdir(exist_ok=True)
+            self.profile_dir.mkdir(exist_ok=True)
+            GitToImageUI._dirs_ready = True
+
+    @property
+    def image_to_image_generator(self):
+        """Image-to-image backend, constructed on first Image-to-Image use"""
+        return _image_to_image_generator()
+
+    @property
+    def batch_scheduler(self):
+        """Coalesces concurrent same-mode requests into batched backend calls"""
+        return _batch_scheduler()
+
     def load_existing_profile(self, username: str) -> Optional[Dict[str, Any]]:
         """Load existing profile if it exists"""
         profile_path = self.profile_dir / f"{username}_profile.json"
-        if profile_path.exists():
-            try:
-                with open(profile_path, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return None
-        return None
+        try:
+            mtime = profile_path.stat().st_mtime
+        except OSError:
+            return None
+        # mtime keys the cache so edited profiles are picked up
+        return _load_profile_cached(str(profile_path), mtime)
     
     def display_profile_summary(self, profile: Dict[str, Any]):
         """Display profile summary in retro style"""
@@ -258,7 +428,7 @@ class GitToImageUI:
                 # Generation mode
                 generation_mode = st.radio(
                     "Generation Mode",
-                    ["Text-to-Image", "Image-to-Image"],
+                    GENERATION_MODES,
                     help="Choose between text-based or profile picture-based generation"
                 )
                 
@@ -268,32 +438,16 @@ class GitToImageUI:
                     
                     use_auto_mode = st.radio(
                         "Generation Style",
-                        ["🍀 I feel lucky (Let AI decide)", "🎯 Custom options"],
+                        AUTO_MODE_OPTIONS,
                         help="Choose automatic generation or customize your options"
                     )
-                    
+
                     if use_auto_mode == "🎯 Custom options":
-                        artistic_style = st.selectbox(
-                            "Artistic Style",
-                            ["Vibrant pop art", "Minimalist design", "Dark cyberpunk", 
-                             "1980s retro wave", "Futuristic cyberpunk", "Chinese ink wash painting",
-                             "Steampunk mechanical", "Dark fantasy concept art"]
-                        )
-                        
-                        character_archetype = st.selectbox(
-                            "Character Archetype",
-                            ["Majestic Bear", "Wise Owl", "Industrious Beaver", "Cunning Fox",
-                             "Agile Octopus", "Loyal Wolf", "Meticulous Hummingbird", 
-                             "Playful Otter", "GitHub Octopus"]
-                        )
-                        
-                        background_env = st.selectbox(
-                            "Background Environment",
-                            ["A server room with glowing racks", "A digital forest with flowing data streams",
-                             "A library of ancient code scrolls", "A futuristic city skyline",
-                             "A workshop filled with gears and circuits", 
-                             "An abstract representation of a neural network"]
-                        )
+                        artistic_style = st.selectbox("Artistic Style", ARTISTIC_STYLES)
+
+                        character_archetype = st.selectbox("Character Archetype", CHARACTER_ARCHETYPES)
+
+                        background_env = st.selectbox("Background Environment", BACKGROUND_ENVIRONMENTS)
                     else:
                         # Set defaults for "I feel lucky" mode
                         artistic_style = None
@@ -305,7 +459,7 @@ class GitToImageUI:
                     
                     transformation_mode = st.selectbox(
                         "Transformation Mode",
-                        ["Portrait Enhancement", "Character Fusion", "Style Transfer", "Technical Overlay"],
+                        TRANSFORMATION_MODES,
                         help="Choose how to transform the profile picture"
                     )
                     
@@ -421,20 +575,21 @@ class GitToImageUI:
             else:
                 st.success("✅ PORTRAIT GENERATED SUCCESSFULLY!")
             
-            # Display the generated image
-            if os.path.exists(result):
-                st.image(result, caption=f"Generated portrait for {username}", use_container_width=True)
-                
-                # Download button
-                with open(result, "rb") as file:
-                    st.download_button(
-                        label="💾 DOWNLOAD IMAGE",
-                        data=file.read(),
-                        file_name=f"{username}_portrait.png",
-                        mime="image/png"
-                    )
-            else:
+            # Display the generated image (read once, reuse the same bytes
+            # for both the preview and the download button)
+            try:
+                image_bytes = Path(result).read_bytes()
+            except FileNotFoundError:
                 st.warning("⚠️ Image file not found, but generation reported success")
+            else:
+                st.image(image_bytes, caption=f"Generated portrait for {username}", use_container_width=True)
+
+                st.download_button(
+                    label="💾 DOWNLOAD IMAGE",
+                    data=image_bytes,
+                    file_name=f"{username}_portrait.png",
+                    mime="image/png"
+                )
         else:
             st.error(f"❌ Image generation failed: {result}")
     
@@ -448,13 +603,22 @@ class GitToImageUI:
             return
         
         try:
-            # Step 1: Download profile picture
+            style_mode = STYLE_MODE_MAP.get(transformation_mode, "fusion")
+
+            # Step 1: Download profile picture while building the prompt in parallel
+            # (both are independent, so overlap the network and CPU work)
             with status_placeholder:
-                st.markdown('<div class="loading-text">📸 DOWNLOADING PROFILE PICTURE...</div>', 
+                st.markdown('<div class="loading-text">📸 DOWNLOADING PROFILE PICTURE...</div>',
                            unsafe_allow_html=True)
-            
-            picture_result = github_analyzer.get_github_profile_picture(username)
-            
+
+            from git_to_image.prompt_generator import generate_image_to_image_prompt
+            download_future = self.pipeline_pool.submit(
+                github_analyzer.get_github_profile_picture, username)
+            prompt_future = self.pipeline_pool.submit(
+                generate_image_to_image_prompt, profile, style_mode)
+
+            picture_result = download_future.result()
+
             if not picture_result['success']:
                 st.error(f"❌ Failed to get profile picture: {picture_result['error']}")
                 return
@@ -467,7 +631,8 @@ class GitToImageUI:
                 st.markdown('<div class="loading-text">🔍 VALIDATING IMAGE...</div>', 
                            unsafe_allow_html=True)
             
-            validation_result = github_analyzer.validate_profile_image(image_path)
+            validation_result = self.pipeline_pool.submit(
+                github_analyzer.validate_profile_image, image_path).result()
             if not validation_result['success']:
                 st.error(f"❌ Profile picture validation failed: {validation_result['error']}")
                 return
@@ -479,21 +644,9 @@ class GitToImageUI:
                 st.markdown('<div class="loading-text">🎨 TRANSFORMING PORTRAIT...</div>', 
                            unsafe_allow_html=True)
             
-            # Map UI transformation modes to backend style modes
-            style_mode_map = {
-                "Portrait Enhancement": "tech_enhancement",
-                "Character Fusion": "character_fusion", 
-                "Style Transfer": "artistic_transformation",
-                "Technical Overlay": "fusion"
-            }
-            
-            style_mode = style_mode_map.get(transformation_mode, "fusion")
-            
-            result = self.image_to_image_generator.generate_profile_based_portrait(
-                profile=profile,
-                image_path=image_path,
-                style_mode=style_mode
-            )
+            result = self.batch_scheduler.submit(
+                profile, image_path, style_mode, prompt=prompt_future.result()
+            ).result()
             
             if result['success']:
                 st.success("🎨 PORTRAIT TRANSFORMATION COMPLETE!")
@@ -505,18 +658,20 @@ class GitToImageUI:
                 # Display the generated images
                 st.markdown("#### 🎨 Generated Portrait(s)")
                 for i, generated_file in enumerate(result['generated_files']):
-                    if os.path.exists(generated_file):
-                        st.image(generated_file, caption=f"Transformed portrait ({style_mode})", use_container_width=True)
-                        
-                        # Download button for each generated image
-                        with open(generated_file, "rb") as file:
-                            st.download_button(
-                                label=f"💾 DOWNLOAD PORTRAIT {i+1}",
-                                data=file.read(),
-                                file_name=f"{username}_{style_mode}_portrait_{i+1}.png",
-                                mime="image/png",
-                                key=f"download_{i}"
-                            )
+                    try:
+                        image_bytes = Path(generated_file).read_bytes()
+                    except FileNotFoundError:
+                        continue
+                    st.image(image_bytes, caption=f"Transformed portrait ({style_mode})", use_container_width=True)
+
+                    # Download button for each generated image
+                    st.download_button(
+                        label=f"💾 DOWNLOAD PORTRAIT {i+1}",
+                        data=image_bytes,
+                        file_name=f"{username}_{style_mode}_portrait_{i+1}.png",
+                        mime="image/png",
+                        key=f"download_{i}"
+                    )
                 
                 # Show session info
                 st.info(f"🎯 Style Mode: {transformation_mode} ({style_mode})")
@@ -7,6 +7,7 @@ This script handles environment setup and launches the Streamlit application
 import os
 import sys
 import subprocess
+from importlib import metadata
 from pathlib import Path
 
 def check_environment():
@@ -30,21 +31,56 @@ def check_environment():
     
     return True
 
+def parse_requirement(line):
+    """Parse a requirements.txt line into (name, minimum_version)"""
+    for op in ('>=', '==', '~='):
+        if op in line:
+            name, version = line.split(op, 1)
+            return name.strip(), version.strip()
+    return line.strip(), None
+
+
+def requirements_satisfied(requirements_file):
+    """Check whether every pinned requirement is already installed"""
+    for line in requirements_file.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        name, min_version = parse_requirement(line)
+        try:
+            installed = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            return False
+        if min_version:
+            installed_parts = [int(p) for p in installed.split('.') if p.isdigit()]
+            required_parts = [int(p) for p in min_version.split('.') if p.isdigit()]
+            if installed_parts < required_parts:
+                return False
+    return True
+
+
 def install_requirements():
     """Install required packages if not already installed"""
+    if os.getenv('GIT_TO_IMAGE_SKIP_INSTALL'):
+        return True
+
     requirements_file = Path(__file__).parent / "requirements.txt"
-    
+
     if requirements_file.exists():
+        if requirements_satisfied(requirements_file):
+            print("✅ Frontend requirements already satisfied, skipping install.")
+            return True
+
         print("📦 Installing frontend requirements...")
         try:
             subprocess.run([
                 sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
-            ], check=True, capture_output=True)
+            ], check=True)
             print("✅ Requirements installed successfully!")
         except subprocess.CalledProcessError as e:
             print(f"❌ Failed to install requirements: {e}")
             return False
-    
+
     return True
 
 def launch_streamlit():
@@ -59,19 +95,17 @@ def launch_streamlit():
     print("="*50 + "\n")
     
     try:
-        subprocess.run([
+        # Replace this launcher process with streamlit itself: no lingering
+        # parent holding memory, and Ctrl-C goes straight to streamlit
+        os.execvp("streamlit", [
             "streamlit", "run", str(app_file),
             "--server.port", "8501",
             "--server.address", "localhost",
             "--browser.gatherUsageStats", "false"
         ])
-    except KeyboardInterrupt:
-        print("\n👋 Shutting down Git-to-Image UI...")
-    except FileNotFoundError:
+    except OSError:
         print("❌ Streamlit not found. Please install it with: pip install streamlit")
         return False
-    
-    return True
 
 def main():
     """Main startup function"""
@@ -3,13 +3,78 @@ Image generation module using Google Gemini
 Based on the image_gen_sample.py reference
 """
 
+import json
 import os
+import re
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple
 from io import BytesIO
 
+# Cap on concurrent Gemini calls so batches overlap I/O without tripping
+# API rate limits
+_MAX_CONCURRENT_GENERATIONS = 8
+
+# Anything outside [A-Za-z0-9_-] gets stripped from filenames; one compiled
+# regex pass instead of a per-character loop
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9_-]+')
+
+# One Gemini client per process: construction does an auth handshake, so
+# share it across ImageGenerator instances, but rebuild after a fork so
+# pooled connections are never shared between processes
+_CLIENT = None
+_CLIENT_PID = None
+
+
+def _get_client():
+    """Lazily build the process-wide Gemini client, fork-safe by pid check."""
+    global _CLIENT, _CLIENT_PID
+    pid = os.getpid()
+    if _CLIENT is None or _CLIENT_PID != pid:
+        _CLIENT = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
+        _CLIENT_PID = pid
+    return _CLIENT
+
+
+# Style templates are fixed data, so build them (and the rendered suffix
+# each one appends to the prompt) once at import time
+_STYLE_TEMPLATES = {
+    'legendary': {
+        'prefix': 'Epic heroic portrait,',
+        'style_modifiers': 'legendary proportions, aura of mastery',
+        'color_scheme': 'rich golds and deep blues',
+        'lighting': 'dramatic cinematic lighting'
+    },
+    'frontend': {
+        'prefix': 'Modern creative portrait,',
+        'style_modifiers': 'vibrant and user-friendly aesthetic',
+        'color_scheme': 'bright modern UI colors with gradients',
+        'lighting': 'clean contemporary lighting'
+    },
+    'backend': {
+        'prefix': 'Technical focused portrait,',
+        'style_modifiers': 'systematic and powerful presence',
+        'color_scheme': 'monochromatic with terminal green accents',
+        'lighting': 'industrial dramatic lighting'
+    },
+    'professional': {
+        'prefix': 'Professional portrait,',
+        'style_modifiers': 'corporate and polished appearance',
+        'color_scheme': 'professional color palette',
+        'lighting': 'professional studio lighting'
+    }
+}
+_STYLE_SUFFIXES = {
+    category: (f"\n\nStyle Enhancement: {template['style_modifiers']}"
+               f"\nColor Scheme: {template['color_scheme']}"
+               f"\nLighting: {template['lighting']}")
+    for category, template in _STYLE_TEMPLATES.items()
+}
+
 try:
     from google import genai
     from PIL import Image
@@ -21,23 +86,34 @@ except ImportError:
 class ImageGenerator:
     """Handles actual image generation using Gemini image API"""
     
-    def __init__(self, output_dir: Path = None):
+    def __init__(self, output_dir: Path = None, max_concurrency: int = None):
         self.output_dir = output_dir or Path("generated_images")
         self.output_dir.mkdir(exist_ok=True)
+        # Bound on concurrent Gemini calls for the fan-out methods below;
+        # the CLI exposes this as --concurrency
+        self.max_concurrency = max_concurrency or _MAX_CONCURRENT_GENERATIONS
+        # Serializes appends to the per-session prompt log when styles are
+        # generated concurrently
+        self._prompt_log_lock = threading.Lock()
         
         # Check if API key is available
         self.api_key = os.getenv('GEMINI_API_KEY')
-        self.client = None
-        
+
         if self.api_key and IMAGING_AVAILABLE:
             try:
-                self.client = genai.Client(api_key=self.api_key)
+                _get_client()
                 self.available = True
             except Exception:
                 self.available = False
         else:
             self.available = False
-    
+
+    @property
+    def client(self):
+        """Shared per-process Gemini client (one auth handshake per process)"""
+        return _get_client()
+
+
     def generate_session_id(self) -> str:
         """Generate a unique session ID for this generation session"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -73,11 +149,23 @@ class ImageGenerator:
             print(f"🎨 Generating image with Gemini (session: {session_id})...")
             print(f"📝 Prompt preview: {prompt[:100]}...")
             
-            # Call the Gemini image generation API
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash-image-preview",
-                contents=prompt,
-            )
+            # Call the Gemini image generation API, backing off briefly on
+            # rate limits (concurrent fan-outs can trip 429s in bursts)
+            for attempt in range(3):
+                try:
+                    response = self.client.models.generate_content(
+                        model="gemini-2.5-flash-image-preview",
+                        contents=prompt,
+                    )
+                    break
+                except Exception as api_error:
+                    message = str(api_error)
+                    if attempt < 2 and ('429' in message or 'RESOURCE_EXHAUSTED' in message.upper()):
+                        wait = 2 ** attempt
+                        print(f"⏳ Rate limited, retrying in {wait}s...")
+                        time.sleep(wait)
+                    else:
+                        raise
             
             # Extract image data from response
             image_parts = [
@@ -89,19 +177,29 @@ class ImageGenerator:
             if not image_parts:
                 return False, "No image data received from Gemini API"
             
-            # Save the image
-            image = Image.open(BytesIO(image_parts[0]))
+            # Save the image. Gemini already returns encoded bytes, so when
+            # they're PNG (the normal case) write them straight to disk;
+            # only other formats pay the PIL decode + re-encode to convert
             image_path = self.output_dir / f"{session_id}_{filename}.png"
-            image.save(image_path)
+            if image_parts[0].startswith(b'\x89PNG\r\n\x1a\n'):
+                image_path.write_bytes(image_parts[0])
+            else:
+                image = Image.open(BytesIO(image_parts[0]))
+                image.save(image_path)
             
-            # Also save the prompt for reference
-            prompt_path = self.output_dir / f"{session_id}_{filename}_prompt.txt"
-            with open(prompt_path, 'w') as f:
-                f.write(f"Session ID: {session_id}\n")
-                f.write(f"Generated: {datetime.now().isoformat()}\n")
-                f.write(f"Filename: {filename}\n")
-                f.write("=" * 50 + "\n\n")
-                f.write(prompt)
+            # Also save the prompt for reference: one JSONL append to the
+            # session log instead of a separate open/write/close txt file
+            # per image
+            prompt_log_path = self.output_dir / f"{session_id}_prompts.jsonl"
+            record = json.dumps({
+                'session_id': session_id,
+                'generated': datetime.now().isoformat(),
+                'filename': filename,
+                'prompt': prompt
+            })
+            with self._prompt_log_lock:
+                with open(prompt_log_path, 'a') as f:
+                    f.write(record + '\n')
             
             return True, str(image_path)
             
@@ -132,41 +230,42 @@ class ImageGenerator:
             'total_count': 0
         }
         
-        # Generate main image
+        # Collect every generation as (key, prompt, filename, randomness)
+        # so main image and variations stream through one bounded pool
+        jobs = []
         if 'main_prompt' in prompts:
-            results['total_count'] += 1
-            success, result = self.generate_image(
-                prompts['main_prompt'], 
-                f"{base_filename}_main", 
-                session_id
-            )
-            results['images']['main'] = {
-                'success': success,
-                'result': result
-            }
-            if success:
-                results['success_count'] += 1
-        
-        # Generate variations
+            jobs.append(('main', prompts['main_prompt'], f"{base_filename}_main", None))
         if 'variations' in prompts:
             for i, variation in enumerate(prompts['variations']):
-                results['total_count'] += 1
-                variation_prompt = variation.get('prompt', '')
                 randomness = variation.get('randomness_level', 0)
-                
-                success, result = self.generate_image(
-                    variation_prompt,
+                jobs.append((
+                    f'variation_{i+1}',
+                    variation.get('prompt', ''),
                     f"{base_filename}_var{i+1}_r{randomness}",
-                    session_id
-                )
-                results['images'][f'variation_{i+1}'] = {
+                    randomness
+                ))
+
+        results['total_count'] = len(jobs)
+        if not jobs:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(len(jobs), self.max_concurrency)) as pool:
+            job_futures = [
+                (key, randomness, pool.submit(self.generate_image, prompt, filename, session_id))
+                for key, prompt, filename, randomness in jobs
+            ]
+            for key, randomness, future in job_futures:
+                success, result = future.result()
+                image_result = {
                     'success': success,
-                    'result': result,
-                    'randomness': randomness
+                    'result': result
                 }
+                if randomness is not None:
+                    image_result['randomness'] = randomness
+                results['images'][key] = image_result
                 if success:
                     results['success_count'] += 1
-        
+
         return results
 
     # =============================================================================
@@ -213,37 +312,46 @@ class ImageGenerator:
         
         print(f"🎨 Generating {len(style_prompts)} artistic style variations for {profile.get('username', 'developer')}...")
         
-        for style_data in style_prompts:
+        def _generate_style(style_data):
             style_name = style_data['style_name']
             prompt = style_data['prompt']
-            variation_num = style_data['variation']
-            
+
             # Generate filename for this style
-            safe_username = "".join(c for c in profile.get('username', 'dev') if c.isalnum() or c in '-_')
-            safe_style = "".join(c for c in style_name.lower().replace(' ', '_') if c.isalnum() or c in '-_')
+            safe_username = _UNSAFE_FILENAME_CHARS.sub('', profile.get('username', 'dev'))
+            safe_style = _UNSAFE_FILENAME_CHARS.sub('', style_name.lower().replace(' ', '_'))
             filename = f"{safe_username}_{safe_style}"
-            
+
             print(f"   🖼️  Generating {style_name} style...")
-            
-            success, result = self.generate_image(
+            return self.generate_image(
                 prompt=prompt,
                 filename=filename,
                 session_id=session_id
             )
-            
-            results['styles'][style_name] = {
-                'success': success,
-                'result': result,
-                'variation_number': variation_num,
-                'developer_category': style_data.get('dev_category', 'general'),
-                'prompt_length': len(prompt)
-            }
-            
-            if success:
-                results['success_count'] += 1
-                print(f"   ✅ {style_name} completed: {result}")
-            else:
-                print(f"   ❌ {style_name} failed: {result}")
+
+        # Each style is an independent multi-second API round-trip; running
+        # them on a pool makes wall-clock roughly the slowest call instead
+        # of the sum of all of them
+        with ThreadPoolExecutor(max_workers=min(len(style_prompts) or 1, self.max_concurrency)) as pool:
+            style_futures = [(style_data, pool.submit(_generate_style, style_data))
+                             for style_data in style_prompts]
+
+            for style_data, future in style_futures:
+                style_name = style_data['style_name']
+                success, result = future.result()
+
+                results['styles'][style_name] = {
+                    'success': success,
+                    'result': result,
+                    'variation_number': style_data['variation'],
+                    'developer_category': style_data.get('dev_category', 'general'),
+                    'prompt_length': len(style_data['prompt'])
+                }
+
+                if success:
+                    results['success_count'] += 1
+                    print(f"   ✅ {style_name} completed: {result}")
+                else:
+                    print(f"   ❌ {style_name} failed: {result}")
         
         # Print summary
         if results['success_count'] > 0:
@@ -285,11 +393,11 @@ class ImageGenerator:
         }
         
         print(f"🚀 Starting batch generation for {len(profiles)} profiles...")
-        
-        for i, profile in enumerate(profiles, 1):
-            username = profile.get('username', f'user_{i}')
-            print(f"\n📊 Processing profile {i}/{len(profiles)}: {username}")
-            
+
+        def _generate_for_profile(index, profile):
+            username = profile.get('username', f'user_{index}')
+            print(f"\n📊 Processing profile {index}/{len(profiles)}: {username}")
+
             # Generate style variations for this profile
             if style_options.get('multi_style', True):
                 profile_results = self.generate_style_variations(
@@ -305,13 +413,23 @@ class ImageGenerator:
                     randomness_range=style_options.get('randomness_range', (0.1, 0.3)),
                     session_id=f"{batch_session_id}_{username}"
                 )
-            
-            results['profiles'][username] = profile_results
-            
-            if profile_results.get('success', False):
-                results['successful_profiles'] += 1
-                if 'success_count' in profile_results:
-                    results['total_images_generated'] += profile_results['success_count']
+            return username, profile_results
+
+        # Each profile's generation is an independent set of Gemini
+        # round-trips, so overlap them on a bounded pool instead of waiting
+        # for each profile in turn
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(profiles) or 1)) as pool:
+            futures = [pool.submit(_generate_for_profile, i, profile)
+                       for i, profile in enumerate(profiles, 1)]
+
+            for future in futures:
+                username, profile_results = future.result()
+                results['profiles'][username] = profile_results
+
+                if profile_results.get('success', False):
+                    results['successful_profiles'] += 1
+                    if 'success_count' in profile_results:
+                        results['total_images_generated'] += profile_results['success_count']
         
         # Print batch summary
         success_rate = (results['successful_profiles'] / results['total_profiles']) * 100
@@ -331,38 +449,8 @@ class ImageGenerator:
         Returns:
             str: Enhanced prompt with style template applied
         """
-        style_templates = {
-            'legendary': {
-                'prefix': 'Epic heroic portrait,',
-                'style_modifiers': 'legendary proportions, aura of mastery',
-                'color_scheme': 'rich golds and deep blues',
-                'lighting': 'dramatic cinematic lighting'
-            },
-            'frontend': {
-                'prefix': 'Modern creative portrait,',
-                'style_modifiers': 'vibrant and user-friendly aesthetic',
-                'color_scheme': 'bright modern UI colors with gradients',
-                'lighting': 'clean contemporary lighting'
-            },
-            'backend': {
-                'prefix': 'Technical focused portrait,',
-                'style_modifiers': 'systematic and powerful presence',
-                'color_scheme': 'monochromatic with terminal green accents',
-                'lighting': 'industrial dramatic lighting'
-            },
-            'professional': {
-                'prefix': 'Professional portrait,',
-                'style_modifiers': 'corporate and polished appearance',
-                'color_scheme': 'professional color palette',
-                'lighting': 'professional studio lighting'
-            }
-        }
-        
-        template = style_templates.get(style_category, style_templates['professional'])
-        
-        enhanced_prompt = f"{template['prefix']} {base_prompt}"
-        enhanced_prompt += f"\n\nStyle Enhancement: {template['style_modifiers']}"
-        enhanced_prompt += f"\nColor Scheme: {template['color_scheme']}"
-        enhanced_prompt += f"\nLighting: {template['lighting']}"
-        
-        return enhanced_prompt
+        if style_category not in _STYLE_TEMPLATES:
+            style_category = 'professional'
+
+        prefix = _STYLE_TEMPLATES[style_category]['prefix']
+        return f"{prefix} {base_prompt}{_STYLE_SUFFIXES[style_category]}"
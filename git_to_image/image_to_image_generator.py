@@ -3,168 +3,554 @@
 
 import os
 import base64
-import mimetypes
+import hashlib
+import json
+import queue
+import shutil
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from google import genai
-from google.genai import types
+
+# google.genai pulls in a sizable dependency tree; it is imported lazily in
+# __init__ so text-only CLI runs never pay the cold-start cost
+
+# Optional semantic cache: near-identical prompts for the same picture and mode
+# (common when profiles share a top language/archetype) reuse cached images
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+# Optional: prompt sidecar files compress ~4-5x with zstd level 1 at
+# effectively zero CPU cost on these sizes
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Gemini keeps Files API uploads for ~48 hours; refresh a little early
+_FILE_HANDLE_TTL = 47 * 3600
+
+# Only a handful of image types matter here; a tiny table avoids loading the
+# full mimetypes registry on first use
+_MIME = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif',
+}
+_EXT = {mime: ext for ext, mime in _MIME.items() if ext != '.jpeg'}
+
+# Deletion table for filename-safe usernames (GitHub logins are ASCII)
+_ALLOWED_USERNAME_CHARS = frozenset(string.ascii_letters + string.digits + '-_')
+_USERNAME_DEL_TABLE = {cp: None for cp in range(128) if chr(cp) not in _ALLOWED_USERNAME_CHARS}
+
+_SEM_SIMILARITY_THRESHOLD = 0.92
+_SEM_INDEX_PATH = os.path.expanduser("~/.cache/git_to_image/sem_index.npz")
+
+_SEM_MODEL = None
+
+
+def _read_prompt(prompt_path):
+    """Read a saved prompt file, transparently decompressing .zst sidecars"""
+    if prompt_path.endswith('.zst'):
+        with open(prompt_path, 'rb') as f:
+            return zstd.ZstdDecompressor().decompress(f.read()).decode()
+    with open(prompt_path) as f:
+        return f.read()
+
+
+def _stream_writer(write_q, errors):
+    """Apply open/write/close commands from a streaming loop, in order.
+
+    Runs on a daemon thread so the network reader never blocks on disk
+    latency; the bounded queue provides backpressure. After the first OSError
+    the remaining commands are drained so the producer cannot deadlock.
+    """
+    fd = None
+    while True:
+        item = write_q.get()
+        try:
+            if item is None:
+                break
+            if errors:
+                continue
+            op, arg = item
+            try:
+                if op == 'open':
+                    fd = os.open(arg, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                elif op == 'write':
+                    view = memoryview(arg)
+                    while view:
+                        view = view[os.write(fd, view):]
+                elif op == 'close':
+                    os.close(fd)
+                    fd = None
+                    print(f"✅ File saved to: {arg}")
+            except OSError as e:
+                errors.append(e)
+        finally:
+            write_q.task_done()
+    if fd is not None:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def _copy_file_kernel(src, dst):
+    """Copy src to dst inside the kernel (sendfile) without a user-space bounce"""
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        size = os.fstat(s.fileno()).st_size
+        try:
+            os.sendfile(d.fileno(), s.fileno(), 0, size)
+        except OSError:
+            shutil.copyfileobj(s, d, length=1024 * 1024)
+
+
+def _sem_model():
+    """Lazily load the (small, local) embedding model once per process"""
+    global _SEM_MODEL
+    if _SEM_MODEL is None:
+        _SEM_MODEL = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+    return _SEM_MODEL
 
 
 class ImageToImageGenerator:
     """Handles image-to-image generation using Gemini 2.5 Flash Image Preview"""
-    
+
+    # One client per process, shared by every instance: re-creating it per
+    # generator would redo the TLS handshake instead of reusing the pool
+    _client = None
+    _client_pid = None
+    _client_lock = threading.Lock()
+
+    @classmethod
+    def _get_client(cls, api_key):
+        """Return the shared per-process client, rebuilding it after a fork"""
+        with cls._client_lock:
+            if cls._client is None or cls._client_pid != os.getpid():
+                from google import genai
+                from google.genai import types
+                cls._client = genai.Client(
+                    api_key=api_key,
+                    http_options=types.HttpOptions(timeout=60_000),
+                )
+                cls._client_pid = os.getpid()
+            return cls._client
+
     def __init__(self):
         """Initialize the image-to-image generator"""
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.available = bool(self.api_key)
         self.model = "gemini-2.5-flash-image-preview"
-        
+        self.output_dir = 'generated_images'
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Generated images are cached on disk so re-running the same
+        # user + picture + mode skips the (multi-second) Gemini call
+        self._cache_dir = os.path.expanduser("~/.cache/git_to_image/i2i")
+        os.makedirs(self._cache_dir, exist_ok=True)
+        # Concurrent modes read and append to the semantic index; serialize
+        # access so embeddings and metadata never drift out of step
+        self._sem_lock = threading.Lock()
+        self._load_sem_index()
+        # Keeps status lines readable when modes generate concurrently
+        self._print_lock = threading.Lock()
+        # Files API handles keyed by image SHA-256: upload each avatar once
+        # per TTL instead of inlining the bytes into every request
+        self._file_handles = {}
+        self._upload_lock = threading.Lock()
+        # In-memory short-circuit for repeated (image, mode, profile) calls
+        # within one process, e.g. two helper methods hitting the same mode
+        self._session_cache = {}
+
         if self.available:
-            self.client = genai.Client(api_key=self.api_key)
+            from google.genai import types
+            self._types = types
+            self.client = self._get_client(self.api_key)
             print("✅ Gemini Image-to-Image Generator initialized")
         else:
+            self._types = None
             print("❌ GEMINI_API_KEY not found. Image-to-image generation will be unavailable.")
     
     def generate_session_id(self):
-        """Generate a unique session ID for organizing outputs"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        # Add a short random component
-        import secrets
-        random_component = secrets.token_hex(4)
-        return f"{timestamp}_{random_component}"
+        """Generate a unique, sortable session ID for organizing outputs"""
+        # monotonic_ns is nondecreasing within a process, so filenames sort in
+        # creation order; two random bytes guard against cross-process ties
+        return f"{time.monotonic_ns():x}_{os.urandom(2).hex()}"
+
+    def generate_session_id_pretty(self):
+        """Human-readable (timestamped) session ID for logs and UI labels"""
+        # Session tags are not security tokens; os.urandom is a thin syscall
+        # wrapper and avoids the secrets-module overhead
+        return f"{time.strftime('%Y%m%d_%H%M%S')}_{os.urandom(4).hex()}"
     
     def save_binary_file(self, file_name, data):
         """Save binary image data to file"""
         try:
-            with open(file_name, "wb") as f:
-                f.write(data)
+            # os.write straight from the payload skips BufferedWriter's
+            # extra copy; the memoryview loop handles short writes
+            fd = os.open(file_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+            finally:
+                os.close(fd)
             print(f"✅ File saved to: {file_name}")
             return True
         except Exception as e:
             print(f"❌ Error saving file {file_name}: {str(e)}")
             return False
-    
-    def generate_profile_based_portrait(self, profile, image_path, style_mode='fusion', session_id=None):
+
+    def _build_session_key(self, profile, image_bytes, style_mode):
+        """In-memory cache key for one (profile, image, mode) call; None if unkeyable"""
+        try:
+            profile_digest = hashlib.blake2b(
+                json.dumps(profile, sort_keys=True, default=str).encode(),
+                digest_size=16
+            ).digest()
+        except TypeError:
+            return None
+        # blake2b streams several GB/s, so hashing the avatar again is cheap
+        image_digest = hashlib.blake2b(image_bytes, digest_size=16).digest()
+        return (image_digest, style_mode, profile_digest)
+
+    def _build_cache_key(self, prompt, image_sha, style_mode):
+        """Build a stable cache key for a (model, mode, image, prompt) tuple"""
+        hasher = hashlib.sha256()
+        hasher.update(self.model.encode())
+        hasher.update(style_mode.encode())
+        hasher.update(bytes.fromhex(image_sha))
+        hasher.update(hashlib.sha256(prompt.encode()).digest())
+        return hasher.hexdigest()
+
+    def _restore_cached_portrait(self, cache_key, output_dir, base_filename):
+        """Hardlink cached images into output_dir; returns file paths or None on miss"""
+        entry_dir = os.path.join(self._cache_dir, cache_key)
+        if not os.path.isdir(entry_dir):
+            return None
+
+        restored = []
+        for file_index, cached_name in enumerate(sorted(os.listdir(entry_dir))):
+            file_extension = os.path.splitext(cached_name)[1]
+            cached_path = os.path.join(entry_dir, cached_name)
+            output_path = os.path.join(output_dir, f"{base_filename}_{file_index}{file_extension}")
+            try:
+                os.link(cached_path, output_path)
+            except OSError:
+                # Cross-device or already-existing target: fall back to a copy
+                _copy_file_kernel(cached_path, output_path)
+            restored.append(output_path)
+        return restored or None
+
+    def _store_cached_portrait(self, cache_key, generated_files):
+        """Copy generated files into the cache atomically (write temp dir, then rename)"""
+        entry_dir = os.path.join(self._cache_dir, cache_key)
+        if os.path.isdir(entry_dir):
+            return
+
+        temp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        try:
+            os.makedirs(temp_dir, exist_ok=True)
+            for file_index, generated_path in enumerate(generated_files):
+                file_extension = os.path.splitext(generated_path)[1]
+                shutil.copyfile(generated_path, os.path.join(temp_dir, f"{file_index:02d}{file_extension}"))
+            os.replace(temp_dir, entry_dir)
+        except OSError:
+            # Caching is best-effort; a lost race or full disk should not fail generation
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _image_part(self, image_path, image_bytes, image_sha, mime_type):
+        """Reference an uploaded Files API handle when possible, else inline the bytes"""
+        with self._upload_lock:
+            cached = self._file_handles.get(image_sha)
+            if cached is not None and cached[2] > time.time():
+                return self._types.Part.from_uri(file_uri=cached[0], mime_type=cached[1])
+            try:
+                uploaded = self.client.files.upload(file=image_path)
+            except Exception:
+                # Files API hiccup: inlining the bytes still works, just costs bandwidth
+                return self._types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
+            self._file_handles[image_sha] = (uploaded.uri, uploaded.mime_type, time.time() + _FILE_HANDLE_TTL)
+            return self._types.Part.from_uri(file_uri=uploaded.uri, mime_type=uploaded.mime_type)
+
+    def _load_sem_index(self):
+        """Load the persisted prompt-embedding index, if the optional deps exist"""
+        with self._sem_lock:
+            self._sem_index = None
+            self._sem_meta = []
+            if not SEMANTIC_CACHE_AVAILABLE:
+                return
+            try:
+                with np.load(_SEM_INDEX_PATH, allow_pickle=False) as data:
+                    self._sem_index = data['embeddings']
+                    self._sem_meta = json.loads(str(data['meta']))
+            except (OSError, KeyError, ValueError):
+                pass
+            # A desynced index (e.g. persisted by a crashed process) would make
+            # every lookup raise; better to start over than to trust it
+            if self._sem_index is not None and self._sem_index.shape[0] != len(self._sem_meta):
+                self._sem_index = None
+                self._sem_meta = []
+
+    def _sem_lookup(self, prompt, image_sha, style_mode):
+        """Return the cache key of a semantically similar prior prompt, or None"""
+        if not SEMANTIC_CACHE_AVAILABLE:
+            return None
+
+        with self._sem_lock:
+            if self._sem_index is None or not self._sem_meta:
+                return None
+
+            # Only compare against prompts for the same picture and mode
+            mask = np.array([
+                entry['image_sha'] == image_sha and entry['style_mode'] == style_mode
+                for entry in self._sem_meta
+            ])
+            if not mask.any():
+                return None
+
+            embedding = _sem_model().encode(prompt, normalize_embeddings=True).astype(np.float32)
+            similarities = self._sem_index[mask] @ embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] > _SEM_SIMILARITY_THRESHOLD:
+                candidates = [entry for entry, keep in zip(self._sem_meta, mask) if keep]
+                return candidates[best]['cache_key']
+            return None
+
+    def _sem_store(self, prompt, image_sha, style_mode, cache_key):
+        """Index a freshly generated prompt so near-duplicates can reuse its images"""
+        if not SEMANTIC_CACHE_AVAILABLE:
+            return
+
+        # Encode outside the lock (the slow part), mutate and persist inside it
+        embedding = _sem_model().encode(prompt, normalize_embeddings=True).astype(np.float32)[None, :]
+        with self._sem_lock:
+            if self._sem_index is None:
+                self._sem_index = embedding
+            else:
+                self._sem_index = np.vstack([self._sem_index, embedding])
+            self._sem_meta.append({
+                'cache_key': cache_key,
+                'image_sha': image_sha,
+                'style_mode': style_mode
+            })
+            try:
+                np.savez(_SEM_INDEX_PATH, embeddings=self._sem_index, meta=json.dumps(self._sem_meta))
+            except OSError:
+                pass
+
+    def generate_profile_based_portrait(self, profile, image_path, style_mode='fusion', session_id=None, prompt=None):
         """
         Generate portrait using profile picture as input with coding style overlay.
-        
+
         Args:
             profile: Developer profile with analysis data
             image_path: Path to the profile picture
             style_mode: Generation mode ('fusion', 'enhancement', 'style_transfer', 'character')
             session_id: Optional session ID for organizing outputs
-            
+            prompt: Optional pre-built prompt (callers can generate it concurrently)
+
         Returns:
             dict: Generation results with success status and file paths
         """
+        try:
+            with open(image_path, 'rb') as image_file:
+                image_data = image_file.read()
+        except OSError as e:
+            return {
+                'success': False,
+                'error': f'Generation failed: {str(e)}'
+            }
+
+        return self._generate_from_bytes(
+            profile=profile,
+            image_bytes=image_data,
+            mime_type=_MIME.get(os.path.splitext(image_path)[1].lower(), 'application/octet-stream'),
+            style_mode=style_mode,
+            session_id=session_id,
+            image_path=image_path,
+            prompt=prompt
+        )
+
+    def _generate_from_bytes(self, profile, image_bytes, mime_type, style_mode, session_id, image_path, prompt=None):
+        """
+        Generate a portrait from pre-read image bytes.
+
+        Callers generating several modes for the same picture read the file and
+        sniff its MIME type once, then share the bytes across every mode.
+        """
         if not self.available:
             return {
                 'success': False,
                 'error': 'Gemini API not available'
             }
-        
+
         if session_id is None:
             session_id = self.generate_session_id()
-        
+
+        # Replay an identical call from earlier in this process without even
+        # touching the disk cache; only safe when the prompt is profile-derived
+        session_key = None
+        if prompt is None:
+            session_key = self._build_session_key(profile, image_bytes, style_mode)
+        if session_key is not None and session_key in self._session_cache:
+            cached_result = dict(self._session_cache[session_key])
+            cached_result['session_id'] = session_id
+            return cached_result
+
         try:
             # Import here to avoid circular imports
             from .prompt_generator import generate_image_to_image_prompt
-            
+
             # Generate the appropriate prompt for the style mode
-            prompt = generate_image_to_image_prompt(profile, style_mode)
-            
-            # Read and validate the image
-            with open(image_path, 'rb') as image_file:
-                image_data = image_file.read()
-            
-            mime_type = mimetypes.guess_type(image_path)[0]
-            
-            # Create the content for Gemini
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_text(text=prompt),
-                        types.Part.from_bytes(
-                            data=image_data,
-                            mime_type=mime_type
-                        ),
-                    ],
-                ),
-            ]
-            
-            generate_content_config = types.GenerateContentConfig(
+            if prompt is None:
+                prompt = generate_image_to_image_prompt(profile, style_mode)
+
+            generate_content_config = self._types.GenerateContentConfig(
                 response_modalities=["IMAGE", "TEXT"],
             )
             
             # Generate filename
             username = profile.get('username', 'user')
-            safe_username = "".join(c for c in username if c.isalnum() or c in '-_')
+            safe_username = username.translate(_USERNAME_DEL_TABLE)
             base_filename = f"{session_id}_{safe_username}_{style_mode}"
             
-            # Create output directory
-            output_dir = 'generated_images'
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-            
-            print(f"🎨 Generating {style_mode} portrait for {username} (session: {session_id})...")
-            print(f"📝 Using profile picture: {os.path.basename(image_path)}")
-            
-            # Stream generation and save results
-            file_index = 0
-            generated_files = []
-            generation_text = []
-            
-            for chunk in self.client.models.generate_content_stream(
-                model=self.model,
-                contents=contents,
-                config=generate_content_config,
-            ):
-                if (
-                    chunk.candidates is None
-                    or chunk.candidates[0].content is None
-                    or chunk.candidates[0].content.parts is None
+            output_dir = self.output_dir
+
+            # Reuse a previous generation for the same user + picture + mode.
+            # hashlib.sha256 dispatches to OpenSSL's SHA-NI path, and the
+            # avatar is hashed exactly once per call
+            image_sha = hashlib.sha256(image_bytes).hexdigest()
+            cache_key = self._build_cache_key(prompt, image_sha, style_mode)
+            generated_files = self._restore_cached_portrait(cache_key, output_dir, base_filename)
+            if generated_files is None:
+                # Exact miss: a near-identical prior prompt is just as good
+                similar_key = self._sem_lookup(prompt, image_sha, style_mode)
+                if similar_key is not None:
+                    generated_files = self._restore_cached_portrait(similar_key, output_dir, base_filename)
+            cache_hit = generated_files is not None
+
+            if cache_hit:
+                print(f"⚡ Cache hit for {style_mode} portrait of {username} — skipping Gemini call")
+            else:
+                print(f"🎨 Generating {style_mode} portrait for {username} (session: {session_id})...")
+                print(f"📝 Using profile picture: {os.path.basename(image_path)}")
+
+                # Create the content for Gemini, referencing the picture by its
+                # uploaded handle so concurrent modes share a single upload
+                contents = [
+                    self._types.Content(
+                        role="user",
+                        parts=[
+                            self._types.Part.from_text(text=prompt),
+                            self._image_part(image_path, image_bytes, image_sha, mime_type),
+                        ],
+                    ),
+                ]
+
+                # Stream generation, handing image chunks to a background
+                # writer so the network reader never blocks on disk latency
+                file_index = 0
+                generated_files = []
+                generation_text = []
+                current_path = None
+                write_errors = []
+                write_q = queue.Queue(maxsize=8)
+                writer = threading.Thread(
+                    target=_stream_writer, args=(write_q, write_errors), daemon=True
+                )
+                writer.start()
+
+                def finish_current_file():
+                    """Close the in-progress image file and record it"""
+                    nonlocal current_path, file_index
+                    if current_path is None:
+                        return
+                    write_q.put(('close', current_path))
+                    generated_files.append(current_path)
+                    file_index += 1
+                    current_path = None
+
+                for chunk in self.client.models.generate_content_stream(
+                    model=self.model,
+                    contents=contents,
+                    config=generate_content_config,
                 ):
-                    continue
-                
-                # Handle image data
-                if (chunk.candidates[0].content.parts[0].inline_data and 
-                    chunk.candidates[0].content.parts[0].inline_data.data):
-                    
-                    inline_data = chunk.candidates[0].content.parts[0].inline_data
-                    data_buffer = inline_data.data
-                    file_extension = mimetypes.guess_extension(inline_data.mime_type) or '.png'
-                    
-                    output_filename = f"{base_filename}_{file_index}{file_extension}"
-                    output_path = os.path.join(output_dir, output_filename)
-                    
-                    if self.save_binary_file(output_path, data_buffer):
-                        generated_files.append(output_path)
-                        file_index += 1
-                
-                # Collect text responses instead of printing immediately
-                elif chunk.text:
-                    generation_text.append(chunk.text)
-            
-            # Print collected generation text if any
-            if generation_text:
-                full_text = ''.join(generation_text)
-                print(f"📝 Generation response: {full_text}")
-            
-            # Save the prompt used
-            prompt_filename = f"{base_filename}_prompt.txt"
-            prompt_path = os.path.join(output_dir, prompt_filename)
-            
-            with open(prompt_path, 'w') as f:
-                f.write(f"Session ID: {session_id}\n")
-                f.write(f"Generated: {datetime.now().isoformat()}\n")
-                f.write(f"Style Mode: {style_mode}\n")
-                f.write(f"Input Image: {os.path.basename(image_path)}\n")
-                f.write(f"Username: {username}\n")
-                f.write("=" * 50 + "\n\n")
-                f.write(prompt)
+                    # Bind the protobuf attribute chain once per chunk
+                    candidates = chunk.candidates
+                    if not candidates:
+                        continue
+                    content = candidates[0].content
+                    if content is None or not content.parts:
+                        continue
+
+                    # Consume every part of the chunk — a multi-part chunk can
+                    # carry text and image data together, and dropping parts
+                    # means re-requesting the whole generation
+                    for part in content.parts:
+                        # Handle image data
+                        if part.inline_data and part.inline_data.data:
+                            inline_data = part.inline_data
+                            if current_path is None:
+                                file_extension = _EXT.get(inline_data.mime_type, '.png')
+                                current_path = os.path.join(output_dir, f"{base_filename}_{file_index}{file_extension}")
+                                write_q.put(('open', current_path))
+                            write_q.put(('write', inline_data.data))
+
+                        # Collect text responses instead of printing immediately;
+                        # text also marks the boundary of the current image part
+                        elif getattr(part, 'text', None):
+                            finish_current_file()
+                            generation_text.append(part.text)
+
+                # Stream ended: close the trailing image, then wait for the
+                # writer to drain before trusting the files on disk
+                finish_current_file()
+                write_q.put(None)
+                write_q.join()
+                writer.join()
+                if write_errors:
+                    raise write_errors[0]
+
+                # Print collected generation text if any
+                if generation_text:
+                    full_text = ''.join(generation_text)
+                    print(f"📝 Generation response: {full_text}")
+
+            # Save the prompt used: one formatted buffer, one write call,
+            # zstd-compressed when the optional dependency is installed
+            prompt_text = (
+                f"Session ID: {session_id}\n"
+                f"Generated: {datetime.now().isoformat()}\n"
+                f"Style Mode: {style_mode}\n"
+                f"Input Image: {os.path.basename(image_path)}\n"
+                f"Username: {username}\n"
+                f"{'=' * 50}\n\n"
+                f"{prompt}"
+            )
+            if ZSTD_AVAILABLE:
+                prompt_path = os.path.join(output_dir, f"{base_filename}_prompt.txt.zst")
+                with open(prompt_path, 'wb') as f:
+                    f.write(zstd.ZstdCompressor(level=1).compress(prompt_text.encode()))
+            else:
+                prompt_path = os.path.join(output_dir, f"{base_filename}_prompt.txt")
+                with open(prompt_path, 'w') as f:
+                    f.write(prompt_text)
             
             if generated_files:
-                return {
+                if not cache_hit:
+                    self._store_cached_portrait(cache_key, generated_files)
+                    self._sem_store(prompt, image_sha, style_mode, cache_key)
+                result = {
                     'success': True,
                     'session_id': session_id,
                     'style_mode': style_mode,
@@ -172,6 +558,11 @@ class ImageToImageGenerator:
                     'prompt_file': prompt_path,
                     'input_image': image_path
                 }
+                if session_key is not None:
+                    if len(self._session_cache) >= 64:
+                        self._session_cache.pop(next(iter(self._session_cache)))
+                    self._session_cache[session_key] = result
+                return result
             else:
                 return {
                     'success': False,
@@ -184,6 +575,40 @@ class ImageToImageGenerator:
                 'error': f'Generation failed: {str(e)}'
             }
     
+    def generate_profile_based_portrait_batch(self, requests, style_mode, session_id=None):
+        """
+        Generate portraits for a batch of coalesced same-mode requests.
+
+        Args:
+            requests: List of (profile, image_path, prompt) tuples sharing the same
+                style mode; prompt may be None to build it per request
+            style_mode: Generation mode shared by every request in the batch
+            session_id: Optional session ID shared by the whole batch
+
+        Returns:
+            list: One generation result dict per request, in input order
+        """
+        if session_id is None:
+            session_id = self.generate_session_id()
+
+        print(f"🎨 Processing batch of {len(requests)} {style_mode} request(s) (session: {session_id})...")
+
+        # Batch members are independent Gemini calls, so run them in parallel
+        # and keep the results in input order
+        with ThreadPoolExecutor(max_workers=min(len(requests) or 1, 4)) as pool:
+            request_futures = [
+                pool.submit(
+                    self.generate_profile_based_portrait,
+                    profile=profile,
+                    image_path=image_path,
+                    style_mode=style_mode,
+                    session_id=session_id,
+                    prompt=prompt
+                )
+                for profile, image_path, prompt in requests
+            ]
+            return [future.result() for future in request_futures]
+
     def create_character_fusion(self, profile, image_path, session_id=None):
         """
         Blend user photo with their coding archetype.
@@ -272,25 +697,45 @@ class ImageToImageGenerator:
         }
         
         username = profile.get('username', 'developer')
-        print(f"🎨 Generating {len(modes)} transformation modes for {username}...")
-        
-        for mode in modes:
-            print(f"   🖼️  Generating {mode} transformation...")
-            
-            mode_result = self.generate_profile_based_portrait(
-                profile=profile,
-                image_path=image_path,
-                style_mode=mode,
-                session_id=session_id
-            )
-            
-            results['transformations'][mode] = mode_result
-            
-            if mode_result.get('success', False):
-                results['success_count'] += 1
-                print(f"   ✅ {mode} completed")
-            else:
-                print(f"   ❌ {mode} failed: {mode_result.get('error', 'Unknown error')}")
+        print(f"🎨 Generating {len(modes)} transformation modes for {username} concurrently...")
+
+        # Read the picture once and share the bytes across every mode
+        try:
+            with open(image_path, 'rb') as image_file:
+                image_bytes = image_file.read()
+        except OSError as e:
+            results['success'] = False
+            results['error'] = f'Could not read {image_path}: {str(e)}'
+            return results
+        mime_type = _MIME.get(os.path.splitext(image_path)[1].lower(), 'application/octet-stream')
+
+        # Each mode is dominated by Gemini network latency, so streaming all of
+        # them in parallel drops wall time from sum(modes) to the slowest one
+        with ThreadPoolExecutor(max_workers=min(len(modes), 4)) as executor:
+            mode_futures = {
+                executor.submit(
+                    self._generate_from_bytes,
+                    profile=profile,
+                    image_bytes=image_bytes,
+                    mime_type=mime_type,
+                    style_mode=mode,
+                    session_id=session_id,
+                    image_path=image_path
+                ): mode
+                for mode in modes
+            }
+
+            for future in as_completed(mode_futures):
+                mode = mode_futures[future]
+                mode_result = future.result()
+                results['transformations'][mode] = mode_result
+
+                with self._print_lock:
+                    if mode_result.get('success', False):
+                        results['success_count'] += 1
+                        print(f"   ✅ {mode} completed")
+                    else:
+                        print(f"   ❌ {mode} failed: {mode_result.get('error', 'Unknown error')}")
         
         # Print summary
         if results['success_count'] > 0:
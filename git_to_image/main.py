@@ -9,6 +9,7 @@ import json
 import os
 import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -368,26 +369,37 @@ class GitToImageCLI:
             print("❌ No valid styles selected")
             return False
         
-        print(f"\n🎯 Generating {len(selected_styles)} selected style(s)...")
+        print(f"\n🎯 Generating {len(selected_styles)} selected style(s) concurrently...")
         session_id = self.image_generator.generate_session_id()
-        
-        # Generate each selected style
+
+        # Build all prompts up front, then let the selected styles share one
+        # bounded pool — each call is dominated by Gemini latency
+        style_jobs = [
+            (style_num, self.create_custom_style_prompt(profile, style_num, dev_category))
+            for style_num in selected_styles
+        ]
+
         success_count = 0
-        for style_num in selected_styles:
-            style_desc = style_categories[style_num]
-            print(f"\n🖼️  Generating: {style_desc}")
-            
-            # Create custom prompt based on selection
-            custom_prompt = self.create_custom_style_prompt(profile, style_num, dev_category)
-            filename = f"{username}_custom_style_{style_num}"
-            
-            success, result = self.generate_image(custom_prompt, filename, session_id)
-            if success:
-                success_count += 1
-                print(f"   ✅ Success: {result}")
-            else:
-                print(f"   ❌ Failed: {result}")
-        
+        max_workers = min(len(style_jobs), self.image_generator.max_concurrency)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            style_futures = [
+                (style_num, pool.submit(
+                    self.image_generator.generate_image,
+                    custom_prompt,
+                    f"{username}_custom_style_{style_num}",
+                    session_id
+                ))
+                for style_num, custom_prompt in style_jobs
+            ]
+            for style_num, future in style_futures:
+                style_desc = style_categories[style_num]
+                success, result = future.result()
+                if success:
+                    success_count += 1
+                    print(f"   ✅ {style_desc}: {result}")
+                else:
+                    print(f"   ❌ {style_desc}: {result}")
+
         print(f"\n📊 Style Selection Complete: {success_count}/{len(selected_styles)} successful")
         return success_count > 0
     
@@ -750,6 +762,8 @@ Examples:
                        help='Number of styles for multi-style generation (1-8, default: 4)')
     parser.add_argument('--style-interactive', action='store_true',
                        help='🆕 Interactive style selection mode')
+    parser.add_argument('--concurrency', type=int, default=5, metavar='N',
+                       help='Max concurrent image generations (default: 5)')
     
     # Phase 5 new arguments  
     parser.add_argument('--profile-picture', action='store_true',
@@ -762,9 +776,10 @@ Examples:
                        help='🆕 Ask for consent before downloading profile picture (Phase 5)')
     
     args = parser.parse_args()
-    
+
     cli = GitToImageCLI()
-    
+    cli.image_generator.max_concurrency = max(1, args.concurrency)
+
     try:
         if args.batch:
             # Batch mode
@@ -3,6 +3,8 @@
 
 from .style_guide import get_weighted_style_elements
 from .thematic_elements import LANGUAGE_THEMES, DOMAIN_THEMES
+import hashlib
+import json
 import random
 
 def generate_image_prompt(profile, user_preferences=None, randomness=0.1):
@@ -616,17 +618,51 @@ CRITICAL: Maintain 100% animal anatomy - no human facial features whatsoever."""
 # PHASE 5: Image-to-Image Prompt Generation  
 # =============================================================================
 
+# Built prompts cached per (profile digest, mode): a multi-mode session asks
+# for the same profile several times, and rebuilding the prompt is pure CPU
+_I2I_PROMPT_CACHE = {}
+_I2I_PROMPT_CACHE_MAX = 256
+
+
+def _profile_cache_key(profile):
+    """Cheap, stable digest of the profile fields that shape i2i prompts"""
+    try:
+        payload = json.dumps(profile, sort_keys=True, default=str)
+    except TypeError:
+        return None
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
 def generate_image_to_image_prompt(profile, transformation_mode='fusion'):
     """
     Generate prompts specifically for image-to-image transformation.
-    
+
+    Repeated calls with the same profile and mode (e.g. the helpers in
+    ImageToImageGenerator) return the cached prompt instantly.
+
     Args:
         profile: Developer profile with analysis data
         transformation_mode: Type of transformation to apply
-        
+
     Returns:
         str: Prompt for image-to-image generation
     """
+    profile_key = _profile_cache_key(profile)
+    cache_key = (profile_key, transformation_mode)
+    if profile_key is not None and cache_key in _I2I_PROMPT_CACHE:
+        return _I2I_PROMPT_CACHE[cache_key]
+
+    prompt = _build_image_to_image_prompt(profile, transformation_mode)
+
+    if profile_key is not None:
+        if len(_I2I_PROMPT_CACHE) >= _I2I_PROMPT_CACHE_MAX:
+            _I2I_PROMPT_CACHE.pop(next(iter(_I2I_PROMPT_CACHE)))
+        _I2I_PROMPT_CACHE[cache_key] = prompt
+    return prompt
+
+
+def _build_image_to_image_prompt(profile, transformation_mode):
+    """Build an image-to-image prompt from scratch (uncached)."""
     from .style_guide import get_enhanced_style_elements
     
     # Get enhanced style elements including Phase 3 analysis